@@ -1,11 +1,23 @@
+import asyncio
+import binascii
+import collections
+import functools
+import queue
+import re
+import selectors
 import socket
-import string
 import struct
 import sys
+import threading
 import time
-from typing import List, Optional
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
 import logging
 
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
 logger = logging.getLogger()
 logger.setLevel(logging.DEBUG)
 
@@ -15,6 +27,42 @@ formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(messag
 handler.setFormatter(formatter)
 logger.addHandler(handler)
 
+# Preformatted GAPI command templates, filled with bytes.__mod__ on the hot path
+_GAPI_COMMAND_TEMPLATE = b"{GAPI %02X 2 %s %02X %04X}"
+_GAPI_MESSAGE_TEMPLATE = _GAPI_COMMAND_TEMPLATE + b"\0"
+_CMD_R = b'R'
+_CMD_W = b'W'
+_CMD_V = b'V'
+
+# Socket buffer size requested to absorb bursts of replies (capped by net.core.rmem_max/wmem_max)
+_SOCKET_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Destination port of the ARP-warming datagram (discard); boards only serve GAPI on port 1240
+_PREWARM_PORT = 9
+
+# ioctl request returning an interface's IPv4 address, from <linux/sockios.h>
+_SIOCGIFADDR = 0x8915
+
+# Not exposed by the socket module; value from <asm-generic/socket.h>
+_SO_BUSY_POLL = getattr(socket, 'SO_BUSY_POLL', 46)
+
+@functools.lru_cache(maxsize=None)
+def _expected_response_prefix(register_space: int, register_address: int) -> str:
+    """Return the leading text of a board's reply for the given register, cached for repeated polling."""
+    return f"{{GAPI {register_space:02X} 1 {register_address:02X} "
+
+# Board info word carried in BEAT replies, as sent on the wire (most significant byte first)
+_BOARD_INFO_STRUCT = struct.Struct(">I")
+
+# Classifies a discovery datagram as a heartbeat and captures its board info hex, without decoding
+_BEAT_RE = re.compile(rb'\{BEAT\s+([0-9A-Fa-f]{1,8})\}')
+
+# Chroma subsampling register values (register space 0x01, address 0x03)
+_CHROMA_SUBSAMPLING = {1: "4:2:0", 2: "4:2:2"}
+
+# Matches each "{...}" GAPI segment of a (possibly batched) response
+_GAPI_SEGMENT_RE = re.compile(r'\{([^}]*)\}')
+
 class SOCBoardError(Exception):
     """Base exception for SOCBoard errors."""
     pass
@@ -31,52 +79,271 @@ class InvalidResponseError(SOCBoardError):
     """Raised when an invalid response is received from the board."""
     pass
 
+def _interface_ipv4_addresses() -> List[str]:
+    """Return the primary IPv4 address of every network interface, read with SIOCGIFADDR (Linux only)."""
+    if fcntl is None or not hasattr(socket, 'if_nameindex'):
+        return []
+    addresses = []
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as query_sock:
+        for _, name in socket.if_nameindex():
+            try:
+                ifreq = fcntl.ioctl(query_sock.fileno(), _SIOCGIFADDR, struct.pack('256s', name[:15].encode()))
+            except OSError:
+                continue  # Interface without an IPv4 address
+            addresses.append(socket.inet_ntoa(ifreq[20:24]))
+    return addresses
+
+def _local_ipv4_addresses() -> List[str]:
+    """Return the IPv4 addresses of the local, non-loopback interfaces."""
+    candidates = _interface_ipv4_addresses()
+    if not candidates:
+        # Without interface enumeration, rely on what the hostname resolves to
+        try:
+            candidates = [info[4][0] for info in socket.getaddrinfo(socket.gethostname(), None, socket.AF_INET, socket.SOCK_DGRAM)]
+        except socket.gaierror:
+            return []
+    addresses = []
+    for address in candidates:
+        if not address.startswith('127.') and address not in addresses:
+            addresses.append(address)
+    return addresses
+
+def _open_heartbeat_socket(port: int, busy_poll_usec: int) -> socket.socket:
+    """Open a non-blocking socket receiving heartbeat replies on port."""
+    receive_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        receive_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _SOCKET_BUFFER_SIZE)
+        if hasattr(socket, 'SO_REUSEPORT'):
+            # Allow several discovery workers to share the heartbeat response port
+            receive_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        receive_sock.bind(('', port))
+    except OSError:
+        receive_sock.close()
+        raise
+    if sys.platform == 'linux':
+        # Busy-poll the NIC queue instead of waiting for an interrupt on each heartbeat reply
+        try:
+            receive_sock.setsockopt(socket.SOL_SOCKET, _SO_BUSY_POLL, busy_poll_usec)
+        except OSError as e:
+            logger.info('SO_BUSY_POLL not available: %s', e)
+    receive_sock.setblocking(False)
+    return receive_sock
+
+def _receive_heartbeats(receive_sock: socket.socket, wakeup_sock: socket.socket, stop: threading.Event,
+                        datagrams: 'queue.Queue[Tuple[bytes, Tuple[str, int]]]') -> None:
+    """Discovery worker: drain receive_sock into datagrams until stop is set."""
+    with selectors.DefaultSelector() as sel:
+        sel.register(receive_sock, selectors.EVENT_READ)
+        # Becomes readable once discovery is over, so stop is noticed without polling
+        sel.register(wakeup_sock, selectors.EVENT_READ)
+        while not stop.is_set():
+            for key, _ in sel.select():
+                if key.fileobj is not receive_sock:
+                    continue
+                # Drain every datagram queued on the socket before waiting again
+                while True:
+                    try:
+                        datagrams.put(receive_sock.recvfrom(1024))
+                    except BlockingIOError:
+                        break
+                    except OSError as e:
+                        logger.warning('Heartbeat receive worker stopped: %s', e)
+                        return
+
+class _SOCProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol resolving in-flight register requests of one board as replies arrive."""
+
+    def __init__(self, board: 'SOCBoard'):
+        self.board = board
+        self.transport = None
+        self.pending: Dict[Tuple[int, int], Deque[asyncio.Future]] = {}
+
+    def connection_made(self, transport: asyncio.DatagramTransport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        try:
+            results = self.board._parse_udp_batch_response(data.decode())
+        except (UnicodeDecodeError, InvalidResponseError) as e:
+            logger.warning('Ignoring UDP message from %s: %s', addr[0], e)
+            return
+        for key, value in results.items():
+            waiters = self.pending.get(key)
+            while waiters:
+                future = waiters.popleft()
+                if not future.done():
+                    future.set_result(value)
+                    break
+            if not waiters:
+                self.pending.pop(key, None)
+
+    def error_received(self, exc: Exception) -> None:
+        self._fail_pending(CommunicationError(f"Failed to receive UDP message: {exc}\0"))
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self._fail_pending(CommunicationError("UDP endpoint closed"))
+
+    def _fail_pending(self, error: SOCBoardError) -> None:
+        for waiters in self.pending.values():
+            for future in waiters:
+                if not future.done():
+                    future.set_exception(error)
+        self.pending.clear()
+
+    async def request(self, key: Tuple[int, int], message: bytes, timeout: float) -> int:
+        future = asyncio.get_running_loop().create_future()
+        waiters = self.pending.setdefault(key, collections.deque())
+        waiters.append(future)
+        try:
+            logger.info('Sending UDP message: "%s"...', message)
+            self.transport.sendto(message)
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise CommunicationError("UDP receive timeout")
+        finally:
+            if future in waiters:
+                waiters.remove(future)
+            if not waiters and self.pending.get(key) is waiters:
+                del self.pending[key]
+
 class SOCBoard:
+    MAX_BATCH_SIZE = 4  # GAPI transactions packed into a single datagram
+
+    BOARD_TYPES = ("Neither", "Encoder", "Decoder", "Both")
+    CODECS = ("MPEG2", "H264", "H265", "Reserved")
+    PRECISIONS = ("8 Bits", "10 Bits")
+    FRAME_RATES = ("Up to 30", "Up to 60", "Up to 120", "Other")
+    RESOLUTIONS = ("Up to 1080p", "Up to 4K", "Up to 8K", "Other")
+    MODULE_FPGAS = ("None", "Artix", "Zynq", "Arria10", "Reserved")
+    BOARD_NAMES = ("S1000", "VTR4000C", "VoIP-X", "VoIP-I", "Reserved")
+
+    # Precomputed values for the bitfields that are not plain enum indexes
+    HAS_AUDIO = (False, True)
+    CHANNELS = tuple(min(62, channels) for channels in range(64))
+
     def __init__(self, ip_address: str):
         self.ip_address = ip_address
         self.udp_port = 1240
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 128)
-        self.socket.bind(('', self.udp_port))
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _SOCKET_BUFFER_SIZE)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _SOCKET_BUFFER_SIZE)
         self.socket.setblocking(True)
         self.socket.settimeout(5)  # 5-second timeout
+        # Fix the peer once so the kernel filters foreign datagrams and sends skip the address lookup
+        try:
+            self.socket.connect((self.ip_address, self.udp_port))
+        except socket.error as e:
+            self.socket.close()
+            raise CommunicationError(f"Failed to connect UDP socket: {e}\0")
+        try:
+            self.prewarm()
+        except CommunicationError as e:
+            logger.warning(e)
+        self._async_endpoint = None  # (event loop, endpoint creation task) for the asyncio API
+
+    def prewarm(self) -> None:
+        """Send an empty datagram so the board's ARP entry is resolved before a burst of register operations."""
+        # Aimed at a port the board doesn't serve, from a throwaway unconnected socket, so no reply
+        # or ICMP error can end up on the GAPI socket ahead of a register reply
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as prewarm_sock:
+                prewarm_sock.sendto(b'', (self.ip_address, _PREWARM_PORT))
+        except socket.error as e:
+            raise CommunicationError(f"Failed to prewarm UDP path: {e}\0")
 
-    def _send_udp_message(self, message: str) -> None:
+    def _send_udp_message(self, message: bytes) -> None:
         try:
-            logger.info(f'Sending UDP message: "{message}"...')
-            self.socket.sendto(message, (self.ip_address, self.udp_port))
-            logger.info(f'Sent UDP message: "{message}"...')
+            logger.info('Sending UDP message: "%s"...', message)
+            self.socket.send(message)
+            logger.info('Sent UDP message: "%s"...', message)
         except socket.error as e:
             raise CommunicationError(f"Failed to send UDP message: {e}\0")
 
     def _receive_udp_message(self) -> str:
         try:
-            data, addr = self.socket.recvfrom(1024)
+            data = self.socket.recv(1024)
             ret = data.decode()
-            logger.info(f'Received UDP message: "{ret}"')
+            logger.info('Received UDP message: "%s"', ret)
             return ret
         except socket.timeout:
             raise CommunicationError("UDP receive timeout")
         except socket.error as e:
             raise CommunicationError(f"Failed to receive UDP message: {e}\0")
 
-    def _create_udp_message(self, register_space: int, command: str, register_address: int, value: int = 0) -> str:
-        
-        return str.encode(f"{{GAPI {register_space:02X} 2 {command} {register_address:02X} {value:04X}}}\0")
+    def _send_many(self, messages: List[bytes]) -> None:
+        try:
+            logger.info('Sending %d UDP message(s): %s...', len(messages), messages)
+            for message in messages:
+                self.socket.send(message)
+            logger.info('Sent %d UDP message(s)', len(messages))
+        except socket.timeout:
+            raise CommunicationError("UDP send timeout")
+        except socket.error as e:
+            raise CommunicationError(f"Failed to send UDP messages: {e}\0")
+
+    def _create_udp_message(self, register_space: int, command: bytes, register_address: int, value: int = 0) -> bytes:
+        return _GAPI_MESSAGE_TEMPLATE % (register_space, command, register_address, value)
 
     def _parse_udp_response(self, response: str, expected_register_space: int, expected_register_address: int) -> int:
-        parts = response.strip("{}\0").split()
-        if len(parts) != 5 or "GAPI" not in parts[0] or parts[1] != f"{expected_register_space:02X}" or parts[2] != "1" or parts[3] != f"{expected_register_address:02X}":
+        prefix = _expected_response_prefix(expected_register_space, expected_register_address)
+        if not response.startswith(prefix):
+            raise InvalidResponseError(f"Unexpected response format: {response}\0")
+        processed_response, closing_brace, _ = response[len(prefix):].partition("}")
+        if not closing_brace or not processed_response or " " in processed_response:
             raise InvalidResponseError(f"Unexpected response format: {response}\0")
-        processed_response = parts[4][:-1]
-        if str.isdigit(processed_response):
-            return int(processed_response)
-        if all(c in string.hexdigits for c in processed_response):
+        return self._parse_register_value(processed_response)
+
+    @staticmethod
+    def _parse_register_value(processed_response: str) -> int:
+        try:
             return int(processed_response, 16)
-        return processed_response
+        except ValueError:
+            return processed_response
+
+    def _create_udp_batch_message(self, command: bytes, operations: List[Tuple[int, int, int]]) -> bytes:
+        return b"".join([_GAPI_COMMAND_TEMPLATE % (register_space, command, register_address, value) for register_space, register_address, value in operations]) + b"\0"
+
+    def _create_udp_batch_messages(self, command: bytes, operations: List[Tuple[int, int, int]]) -> List[bytes]:
+        return [self._create_udp_batch_message(command, operations[start:start + self.MAX_BATCH_SIZE])
+                for start in range(0, len(operations), self.MAX_BATCH_SIZE)]
+
+    def _parse_udp_batch_response(self, response: str) -> Dict[Tuple[int, int], int]:
+        return dict(self._parse_udp_batch_segments(response))
+
+    def _parse_udp_batch_segments(self, response: str) -> List[Tuple[Tuple[int, int], int]]:
+        """Parse every GAPI reply segment in order, keeping repeated registers."""
+        results = []
+        for segment in _GAPI_SEGMENT_RE.findall(response):
+            parts = segment.split()
+            try:
+                if len(parts) != 5 or parts[0] != "GAPI" or parts[2] != "1":
+                    raise ValueError
+                key = (int(parts[1], 16), int(parts[3], 16))
+            except ValueError:
+                raise InvalidResponseError(f"Unexpected response format: {response}\0")
+            results.append((key, self._parse_register_value(parts[4])))
+        return results
+
+    def _transact_batch(self, command: bytes, operations: List[Tuple[int, int, int]]) -> Dict[Tuple[int, int], int]:
+        # Put every packet on the wire before reading any reply, then match replies by register
+        messages = self._create_udp_batch_messages(command, operations)
+        self._send_many(messages)
+        # One reply is expected per operation sent, including repeated registers, so none is left queued
+        outstanding = collections.Counter((register_space, register_address) for register_space, register_address, _ in operations)
+        results = {}
+        while outstanding:
+            for key, value in self._parse_udp_batch_segments(self._receive_udp_message()):
+                if outstanding[key] > 0:
+                    # Replies come back in send order, so a repeated register ends with its last value
+                    results[key] = value
+                    outstanding[key] -= 1
+                    if not outstanding[key]:
+                        del outstanding[key]
+        return results
 
     def read_register(self, register_space: int, register_address: int) -> int:
-        message = self._create_udp_message(register_space, "R", register_address)
+        message = self._create_udp_message(register_space, _CMD_R, register_address)
         self._send_udp_message(message)
         response = self._receive_udp_message()
         return self._parse_udp_response(response, register_space, register_address)
@@ -85,11 +352,11 @@ class SOCBoard:
         if verify:
             return self.verified_write_register(register_space, register_address, value)
         else:
-            message = self._create_udp_message(register_space, "W", register_address, value)
+            message = self._create_udp_message(register_space, _CMD_W, register_address, value)
             self._send_udp_message(message)
 
     def verified_write_register(self, register_space: int, register_address: int, value: int) -> None:
-        message = self._create_udp_message(register_space, "V", register_address, value)
+        message = self._create_udp_message(register_space, _CMD_V, register_address, value)
         self._send_udp_message(message)
         response = self._receive_udp_message()
         read_value = self._parse_udp_response(response, register_space, register_address)
@@ -97,55 +364,216 @@ class SOCBoard:
             raise WriteVerificationError(f"Write verification failed. Wrote {value:04X}, read back {read_value:04X}\0")
         return read_value
 
+    def read_registers(self, registers: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], int]:
+        """Read several (register_space, register_address) pairs, packing up to MAX_BATCH_SIZE reads per datagram."""
+        # Each register is read once, so a batch never leaves an extra reply queued on the socket
+        registers = list(dict.fromkeys(registers))
+        results = self._transact_batch(_CMD_R, [(register_space, register_address, 0) for register_space, register_address in registers])
+        return {register: results[register] for register in registers}
+
+    def write_registers(self, operations: Iterable[Tuple[int, int, int]], verify: bool = True) -> Optional[Dict[Tuple[int, int], int]]:
+        """Write several (register_space, register_address, value) triples, packing up to MAX_BATCH_SIZE writes per datagram."""
+        if verify:
+            return self.verified_write_registers(operations)
+        self._send_many(self._create_udp_batch_messages(_CMD_W, list(operations)))
+        return None
+
+    def verified_write_registers(self, operations: Iterable[Tuple[int, int, int]]) -> Dict[Tuple[int, int], int]:
+        """Write and read back several triples, sending every write before draining the verify replies."""
+        operations = list(operations)
+        results = self._transact_batch(_CMD_V, operations)
+        # When a register is written more than once, only the last value can be read back
+        expected = {(register_space, register_address): value for register_space, register_address, value in operations}
+        for (register_space, register_address), value in expected.items():
+            read_value = results[(register_space, register_address)]
+            if read_value != value:
+                raise WriteVerificationError(f"Write verification failed. Wrote {value:04X}, read back {read_value:04X}\0")
+        return {key: results[key] for key in expected}
+
+    '''
+    ASYNCIO API
+    '''
+
+    async def _get_async_protocol(self) -> _SOCProtocol:
+        loop = asyncio.get_running_loop()
+        endpoint = self._async_endpoint
+        if endpoint is None or endpoint[0] is not loop:
+            # Share one endpoint between concurrent first calls on this loop
+            endpoint = (loop, loop.create_task(loop.create_datagram_endpoint(lambda: _SOCProtocol(self), remote_addr=(self.ip_address, self.udp_port))))
+            self._async_endpoint = endpoint
+        try:
+            # Shielded so a cancelled caller doesn't cancel the creation shared with other callers
+            transport, protocol = await asyncio.shield(endpoint[1])
+        except OSError as e:
+            # Forget the failed attempt so the next call retries
+            if self._async_endpoint is endpoint:
+                self._async_endpoint = None
+            raise CommunicationError(f"Failed to open UDP endpoint: {e}\0")
+        if transport.is_closing():
+            if self._async_endpoint is endpoint:
+                self._async_endpoint = None
+            return await self._get_async_protocol()
+        return protocol
+
+    async def read_register_async(self, register_space: int, register_address: int, timeout: float = 5) -> int:
+        """Read a register without blocking, so reads to many boards or registers can be in flight at once."""
+        protocol = await self._get_async_protocol()
+        message = self._create_udp_message(register_space, _CMD_R, register_address)
+        return await protocol.request((register_space, register_address), message, timeout)
+
+    async def write_register_async(self, register_space: int, register_address: int, value: int, verify: bool = True, timeout: float = 5) -> None:
+        if verify:
+            return await self.verified_write_register_async(register_space, register_address, value, timeout)
+        protocol = await self._get_async_protocol()
+        protocol.transport.sendto(self._create_udp_message(register_space, _CMD_W, register_address, value))
+
+    async def verified_write_register_async(self, register_space: int, register_address: int, value: int, timeout: float = 5) -> None:
+        protocol = await self._get_async_protocol()
+        message = self._create_udp_message(register_space, _CMD_V, register_address, value)
+        read_value = await protocol.request((register_space, register_address), message, timeout)
+        if read_value != value:
+            raise WriteVerificationError(f"Write verification failed. Wrote {value:04X}, read back {read_value:04X}\0")
+        return read_value
+
+    async def close_async(self) -> None:
+        """Close the asyncio endpoint opened by the *_async methods, if any."""
+        endpoint, self._async_endpoint = self._async_endpoint, None
+        if endpoint is None or endpoint[0] is not asyncio.get_running_loop():
+            return
+        try:
+            transport, _ = await endpoint[1]
+        except OSError:
+            return  # Never opened, nothing to close
+        transport.close()
+
     @staticmethod
-    def discover_boards(multicast_group = '239.255.255.1', timeout = 5) -> List['SOCBoard']:
+    def discover_boards(multicast_group = '239.255.255.1', timeout = 5.0, idle_gap = 0.5, expected: Optional[int] = None, receive_workers = 4) -> List['SOCBoard']:
+        """Discover boards by enabling their heartbeat and collecting the BEAT replies.
+
+        Listening stops after idle_gap seconds without a new board, once expected
+        boards have replied, or after timeout seconds at most. A short idle_gap is
+        fast on a quiet LAN but can miss slow boards; if a board is missing, call
+        again with a larger idle_gap (or expected set to the known board count).
+
+        Replies are drained by receive_workers threads, each with its own socket
+        sharing the response port through SO_REUSEPORT (one worker without it).
+        """
         MULTICAST_TTL = 128
         ENABLE_HEARTBEAT_PORT = 1240
         HEARTBEAT_RESPONSE_PORT = 1270
+        BUSY_POLL_USEC = 50
         
-        # Create a UDP socket for sending messages
-        send_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        send_sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, MULTICAST_TTL)
+        # Create the UDP sockets for responses first, so a busy response port fails before anything else is open
+        receive_socks = [_open_heartbeat_socket(HEARTBEAT_RESPONSE_PORT, BUSY_POLL_USEC)]
+        if hasattr(socket, 'SO_REUSEPORT'):
+            for _ in range(receive_workers - 1):
+                try:
+                    receive_socks.append(_open_heartbeat_socket(HEARTBEAT_RESPONSE_PORT, BUSY_POLL_USEC))
+                except OSError as e:
+                    logger.warning('Could not open additional heartbeat socket: %s', e)
+                    break
         
-        # Create UDP socket for response
-        receive_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        receive_sock.bind(('', HEARTBEAT_RESPONSE_PORT))
-        receive_sock.settimeout(timeout)  # Listen for 5 seconds
+        send_socks = []
+        try:
+            # Create one UDP socket per local interface for sending messages
+            for interface_address in _local_ipv4_addresses():
+                send_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                try:
+                    send_sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+                    send_sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, MULTICAST_TTL)
+                    send_sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(interface_address))
+                    send_sock.bind((interface_address, 0))
+                except OSError as e:
+                    # e.g. a stale /etc/hosts entry that is not on any local interface
+                    logger.warning('Skipping interface %s: %s', interface_address, e)
+                    send_sock.close()
+                    continue
+                send_socks.append(send_sock)
+            if not send_socks:
+                # No usable interface address, let the OS pick the route
+                logger.info('No usable interface address found, sending heartbeat activation on the default route only')
+                send_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                send_socks.append(send_sock)
+                send_sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+                send_sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, MULTICAST_TTL)
+            wakeup_recv_sock, wakeup_send_sock = socket.socketpair()
+        except BaseException:
+            for sock in send_socks + receive_socks:
+                sock.close()
+            raise
+        stop = threading.Event()
+        datagrams = queue.Queue()
+        workers = [threading.Thread(target=_receive_heartbeats, args=(receive_sock, wakeup_recv_sock, stop, datagrams), daemon=True)
+                   for receive_sock in receive_socks]
+        for worker in workers:
+            worker.start()
         discovered_boards = []
+        beating_boards = []
+        discovered_addresses = set()
 
         try:
-            # Turn on heartbeat
-            logger.info(f'Sending heartbeat activation...')
+            # Turn on heartbeat on every interface before listening for any reply
+            logger.info('Sending heartbeat activation on %d interface(s)...', len(send_socks))
             message = b"{GAPI 00 2 W B0 1234}\0"
-            send_sock.sendto(message, (multicast_group, ENABLE_HEARTBEAT_PORT))
-            start_time = time.time()
+            for send_sock in send_socks:
+                try:
+                    send_sock.sendto(message, (multicast_group, ENABLE_HEARTBEAT_PORT))
+                except socket.error as e:
+                    logger.warning('Failed to send heartbeat activation from %s: %s', send_sock.getsockname()[0], e)
+            deadline = time.monotonic() + timeout
+            last_rx_time = time.monotonic()
             
-            while time.time() - start_time < timeout:  # Listen for responses for 5 seconds
+            while expected is None or len(discovered_boards) < expected:  # Listen until no new board replied for idle_gap, or the deadline
+                now = time.monotonic()
+                if now >= deadline or now - last_rx_time > idle_gap:
+                    break
                 try:
-                    data, addr = receive_sock.recvfrom(1024)
-                    dat = data.decode().strip('{}\r\n ').split()[-1]
-                    logger.info(f'Got UDP message: "{data}" with payload {dat}')
-                    if b'{BEAT' in data:
-                        logger.info(f'Got Heartbeat from {addr[0]}')
-                            # # Step 3: Turn off the heartbeat for this device
-                            # stop_message = b'{GAPI 00 2 W B0 4321}'
-                            # send_sock.sendto(stop_message, (addr[0], 1270))
-                        board = SOCBoard(addr[0])
-                        board._parse_board_info(int(dat, 16))
-                        discovered_boards.append(board)
-                        
-                        # Turn off heartbeat for this board
-                        board._turn_off_heartbeat()
-                except socket.timeout:
+                    data, addr = datagrams.get(timeout=min(deadline - now, idle_gap - (now - last_rx_time)))
+                except queue.Empty:
                     continue
+                logger.info('Got UDP message: "%s"', data)
+                beat = _BEAT_RE.match(data)
+                # Boards keep beating until turned off, and multicast replies reach every worker,
+                # so only count each address once
+                if beat is not None and addr[0] not in discovered_addresses:
+                    logger.info('Got Heartbeat from %s', addr[0])
+                    last_rx_time = time.monotonic()
+                    discovered_addresses.add(addr[0])
+                    # A bad heartbeat only skips its own board instead of ending discovery
+                    try:
+                        board = SOCBoard(addr[0])
+                    except SOCBoardError as e:
+                        logger.warning('Ignoring heartbeat from %s: %s', addr[0], e)
+                        continue
+                    beating_boards.append(board)
+                    try:
+                        board._parse_board_info(binascii.unhexlify(beat.group(1).zfill(8)))
+                    except (IndexError, struct.error) as e:
+                        logger.warning('Ignoring heartbeat from %s with unsupported board info: %s', addr[0], e)
+                        continue
+                    discovered_boards.append(board)
         
         except Exception as e:
             logging.critical(e, exc_info=True)
 
         finally:
-            logger.info(f'Closing discovery socket...')
-            send_sock.close()
-            receive_sock.close()
+            # Turn off heartbeat for every board that answered, even if discovery was interrupted
+            for board in beating_boards:
+                try:
+                    board._turn_off_heartbeat()
+                except SOCBoardError as e:
+                    logger.warning('Failed to turn off heartbeat for %s: %s', board.ip_address, e)
+            logger.info('Closing discovery sockets...')
+            stop.set()
+            wakeup_send_sock.send(b'\0')
+            for worker in workers:
+                worker.join()
+            for send_sock in send_socks:
+                send_sock.close()
+            for receive_sock in receive_socks:
+                receive_sock.close()
+            wakeup_send_sock.close()
+            wakeup_recv_sock.close()
         
         return discovered_boards
 
@@ -153,20 +581,20 @@ class SOCBoard:
         self.write_register(0, 0xB0, 0x1234)
 
     def _turn_off_heartbeat(self) -> None:
-        self.write_register(0, 0xB0, 0x4321, False)
-
-    def _parse_board_info(self, info: int) -> None:
-
-        self.board_type = ["Neither", "Encoder", "Decoder", "Both"][(info & 0b11)] # Bits 1:0
-        self.has_audio = bool((info >> 2) & 0b1) # Bit 2
-        self.codec = ["MPEG2", "H264", "H265", "Reserved"][(info >> 3) & 0b111] # Bits 5:3
-        self.precision = "10 Bits" if (info >> 6) & 0b1 else "8 Bits" # Bit 6
-        self.fps = ["Up to 30", "Up to 60", "Up to 120", "Other"][(info >> 7) & 0b11] # Bits 8:7
-        self.resolution = ["Up to 1080p", "Up to 4K", "Up to 8K", "Other"][(info >> 9) & 0b11] # Bits 10:9
-        self.module_fpga = ["None", "Artix", "Zynq", "Arria10", "Reserved"][(info >> 11) & 0b111] # Bits 13:11
-        self.channels = min(62, (info >> 14) & 0b111111) # Bits 19:14
-        self.board_name = ["S1000", "VTR4000C", "VoIP-X", "VoIP-I", "Reserved"][(info >> 20) & 0b11111] # Bits 24:20
+        # Fire-and-forget unicast write; a verify read-back would add a round-trip per board
+        self.write_register(0, 0xB0, 0x4321, verify=False)
 
+    def _parse_board_info(self, info_bytes: bytes) -> None:
+        (info,) = _BOARD_INFO_STRUCT.unpack(info_bytes)
+        self.board_type = self.BOARD_TYPES[info & 0b11] # Bits 1:0
+        self.has_audio = self.HAS_AUDIO[(info >> 2) & 0b1] # Bit 2
+        self.codec = self.CODECS[(info >> 3) & 0b111] # Bits 5:3
+        self.precision = self.PRECISIONS[(info >> 6) & 0b1] # Bit 6
+        self.fps = self.FRAME_RATES[(info >> 7) & 0b11] # Bits 8:7
+        self.resolution = self.RESOLUTIONS[(info >> 9) & 0b11] # Bits 10:9
+        self.module_fpga = self.MODULE_FPGAS[(info >> 11) & 0b111] # Bits 13:11
+        self.channels = self.CHANNELS[(info >> 14) & 0b111111] # Bits 19:14
+        self.board_name = self.BOARD_NAMES[(info >> 20) & 0b11111] # Bits 24:20
 
     def get_board_info(self) -> dict:
         """Return a dictionary containing all parsed board information."""
@@ -201,14 +629,7 @@ class SOCBoard:
         return self.write_register(0x01, 0x97, bitrate, verify)
     
     def getChromaSubsampling(self):
-        val = self.read_register(0x01, 0x03)
-        match val:
-            case 1:
-                return "4:2:0"
-            case 2:
-                return "4:2:2"
-            case _:
-                return "Unknown"
+        return _CHROMA_SUBSAMPLING.get(self.read_register(0x01, 0x03), "Unknown")
 
 def discover_and_print_boards(target = '239.255.255.1'):
     """Utility function to discover and print information about all boards on the network."""
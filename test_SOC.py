@@ -0,0 +1,87 @@
+import re
+import socket
+import threading
+import unittest
+
+from SOC import SOCBoard, WriteVerificationError
+
+_COMMAND_RE = re.compile(rb'\{GAPI ([0-9A-F]{2}) 2 ([RWV]) ([0-9A-F]{2}) ([0-9A-F]{4})\}')
+
+
+class FakeBoard:
+    """Loopback stand-in for a board, answering every R/V command of a datagram in a single reply."""
+
+    def __init__(self, ip_address: str, stuck_registers=()):
+        self.registers = {}
+        self.stuck_registers = set(stuck_registers)
+        self.datagrams = []
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((ip_address, 1240))
+        self.socket.settimeout(0.1)
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self) -> None:
+        while not self.stop.is_set():
+            try:
+                data, addr = self.socket.recvfrom(2048)
+            except socket.timeout:
+                continue
+            self.datagrams.append(data)
+            reply = []
+            for space, command, address, value in _COMMAND_RE.findall(data):
+                key = (int(space, 16), int(address, 16))
+                if command in (b'W', b'V') and key not in self.stuck_registers:
+                    self.registers[key] = int(value, 16)
+                if command in (b'R', b'V'):
+                    reply.append(b'{GAPI %s 1 %s %04X}' % (space, address, self.registers.get(key, 0)))
+            if reply:
+                self.socket.sendto(b''.join(reply) + b'\r\n', addr)
+
+    def close(self) -> None:
+        self.stop.set()
+        self.thread.join()
+        self.socket.close()
+
+
+class BatchedRegisterTest(unittest.TestCase):
+    def setUp(self):
+        self.fake = FakeBoard('127.0.0.21', stuck_registers={(0x01, 0x50)})
+        self.board = SOCBoard('127.0.0.21')
+        self.board.socket.settimeout(1)
+
+    def tearDown(self):
+        self.board.socket.close()
+        self.fake.close()
+
+    def test_read_registers_across_packets(self):
+        registers = [(0x01, address) for address in range(6)]
+        self.fake.registers.update({register: register[1] + 0x100 for register in registers})
+        self.assertEqual(self.board.read_registers(registers), {register: register[1] + 0x100 for register in registers})
+        self.assertEqual(len(self.fake.datagrams), 2)
+
+    def test_read_registers_with_duplicates_leaves_no_reply_queued(self):
+        self.fake.registers[(0x01, 0x97)] = 0x0DAC
+        results = self.board.read_registers([(0x01, 1), (0x01, 2), (0x01, 3), (0x01, 4), (0x01, 1)])
+        self.assertEqual(list(results), [(0x01, 1), (0x01, 2), (0x01, 3), (0x01, 4)])
+        self.assertEqual(self.board.read_register(0x01, 0x97), 0x0DAC)
+
+    def test_verified_write_registers_with_duplicates(self):
+        results = self.board.verified_write_registers([(0x01, 1, 5), (0x01, 2, 6), (0x01, 3, 7), (0x01, 4, 8), (0x01, 1, 9)])
+        self.assertEqual(results, {(0x01, 1): 9, (0x01, 2): 6, (0x01, 3): 7, (0x01, 4): 8})
+        self.fake.registers[(0x01, 0x97)] = 0x0DAC
+        self.assertEqual(self.board.read_register(0x01, 0x97), 0x0DAC)
+
+    def test_verified_write_registers_detects_mismatch(self):
+        with self.assertRaises(WriteVerificationError):
+            self.board.write_registers([(0x01, 0x10, 1), (0x01, 0x50, 2)])
+
+    def test_unverified_write_registers(self):
+        self.board.write_registers([(0x01, address, address) for address in range(5)], verify=False)
+        self.assertEqual(self.board.read_registers([(0x01, 4)]), {(0x01, 4): 4})
+        self.assertTrue(all(b' W ' in datagram for datagram in self.fake.datagrams[:2]))
+
+
+if __name__ == '__main__':
+    unittest.main()